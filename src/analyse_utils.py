@@ -10,11 +10,12 @@
 
 import json
 import itertools
+import functools
+from collections import OrderedDict
 import pandas as pd
 from matplotlib import pyplot as plt
 from scipy.optimize import curve_fit
 from scipy.integrate import simpson
-from localcider.sequenceParameters import SequenceParameters
 import mdtraj as md
 import numpy as np
 
@@ -55,17 +56,14 @@ def load_fasta_seq(fasta_path: str) -> tuple:
 
     """
 
-    # Loading file
+    # Loading file, removing all whitespace from the sequence
+    # (Whether standard FASTA format or one-line-sequence FASTA format)
     with open(fasta_path, 'r') as file:
-        lines = file.readlines()
+        header = file.readline().strip()
+        seq = file.read().translate(str.maketrans('', '', ' \t\r\n'))
 
-    # Removing whitespace
-    lines = [line.strip() for line in lines]
-
-    # Assembling data (Whether standard FASTA format or one-line-sequence FASTA format)
-    seq = ''.join(lines[1:])
-    id = lines[0].split(' ')[0][1:]
-    desc = ' '.join(lines[0].split(' ')[1:])
+    # Parsing header
+    id, _, desc = header[1:].partition(' ')
 
     return seq, id, desc
 
@@ -104,12 +102,12 @@ def load_metadata(metadata_path: str, join=True) -> pd.DataFrame:
         metadata = json.load(file)
     
     # Parsing data and templates fields
-    data = pd.DataFrame(metadata['data']).transpose()
-    templates = pd.DataFrame(metadata['templates']).transpose()
+    data = pd.DataFrame.from_dict(metadata['data'], orient='index')
+    templates = pd.DataFrame.from_dict(metadata['templates'], orient='index')
 
     # Joining templates on to data (unique fields only)
     if join:
-        unique_fields = list(set(templates) - set(data))
+        unique_fields = templates.columns.difference(data.columns)
         metadata = data.join(templates[unique_fields], on='template')
     else:
         metadata = (data, templates)
@@ -117,6 +115,17 @@ def load_metadata(metadata_path: str, join=True) -> pd.DataFrame:
     return metadata
 
 
+#························································································#
+def _as_seq_list(seqs) -> list:
+    """
+
+    Takes one or more sequences, returns them as a list of sequences.
+
+    """
+
+    return [seqs] if isinstance(seqs, str) else list(seqs)
+
+
 #························································································#
 #····························· A M I N O   A C I D S ····································#
 #························································································#
@@ -129,6 +138,35 @@ A list of the one-letter codes of the naturally occuring amino acids.
 """
 
 
+#························································································#
+AA_ORDS = np.frombuffer(''.join(amino_acids).encode('ascii'), dtype=np.uint8)
+"""
+
+An array of the ASCII codes of the one-letter codes in `amino_acids` (in the same order).
+
+"""
+
+
+#························································································#
+AA_INDEX = np.full(256, -1, dtype=np.int8)
+AA_INDEX[AA_ORDS] = np.arange(len(amino_acids))
+"""
+
+An array mapping ASCII codes of amino acids to their index in `amino_acids`; -1 for other characters.
+
+"""
+
+
+#························································································#
+VALID_MASK = np.zeros(256, dtype=bool)
+VALID_MASK[AA_ORDS] = True
+"""
+
+An array mapping ASCII codes to whether they are the one-letter code of an amino acid.
+
+"""
+
+
 #························································································#
 amino_acid_types = pd.Series({
     'A': 'Hydrophobic',
@@ -170,7 +208,56 @@ Schema
 
 
 #························································································#
-def amino_acid_content(seqs) -> pd.DataFrame:
+TYPE_CODE = {'Hydrophobic': 0, 'Polar': 1, 'Positive': 2, 'Negative': 3, 'Special': 4}
+"""
+
+A dictionary of integer codes for the general types of amino acids (See `amino_acid_types`).
+
+"""
+
+
+#························································································#
+TYPES_LUT = np.full(256, -1, dtype=np.int8)
+TYPES_LUT[[ord(aa) for aa in amino_acid_types.index]] = amino_acid_types.map(TYPE_CODE).to_numpy()
+"""
+
+An array mapping ASCII codes of amino acids to the code of their general type (See `TYPE_CODE`);
+-1 for characters that are not amino acids.
+
+"""
+
+
+#························································································#
+def amino_acid_type_codes(seq: str) -> np.ndarray:
+    """
+
+    Takes a sequence, returns the general type code of each residue (See `TYPE_CODE`).
+
+    --------------------------------------------------------------------------------
+
+    Parameters
+    ----------
+
+        `seq`: `str`
+            Sequence to classify residues of
+
+    Returns
+    -------
+
+        `codes`: `np.ndarray[int]; [n_residues]`
+            The type code of each residue in the sequence (-1 for non-amino acid characters)
+
+    """
+
+    # Looking up the type of each residue by its ASCII code
+    # (Non-ASCII characters are replaced by '?', so they get no type)
+    codes = TYPES_LUT[np.frombuffer(seq.upper().encode('ascii', errors='replace'), dtype=np.uint8)]
+
+    return codes
+
+
+#························································································#
+def amino_acid_content(seqs, index=None) -> pd.DataFrame:
     """
 
     Takes one or more sequences, returns a DataFrame of the frequencies of amino acids.
@@ -180,9 +267,13 @@ def amino_acid_content(seqs) -> pd.DataFrame:
     Parameters
     ----------
     
-        `seqs`: `str | list | pandas.Series`
+        `seqs`: `str | list | numpy.ndarray | pandas.Series`
             Sequence(s) to calculate frequencies for
 
+        `index`: `list | pandas.Index`
+            Index of the returned DataFrame;
+            Default is the index of `seqs` if a `pandas.Series`, otherwise a range index
+
     Returns
     -------
 
@@ -191,28 +282,112 @@ def amino_acid_content(seqs) -> pd.DataFrame:
 
     """
 
-    # Formatting sequence(s) as a pd.Series
-    if type(seqs) == str:
-        seqs = pd.Series([seqs])
-    elif type(seqs) == list:
-        seqs = pd.Series(seqs)
-    
-    # Initiating DataFrame
-    freqs = pd.DataFrame(index=seqs.index)
-
-    # Calculating frequencies
-    seqs = seqs.str.upper()
-    for aa in amino_acids:
-        freqs[aa] = seqs.apply(lambda seq: len(list(filter(lambda s: s == aa, seq))) / len(seq))
+    # Counting directly for a single sequence
+    if isinstance(seqs, str):
+        freqs = pd.DataFrame([_aa_freqs(seqs)], index=index, columns=amino_acids)
+        return freqs
+
+    # Formatting sequence(s) as a list (Keeping the index of a pd.Series)
+    if index is None and isinstance(seqs, pd.Series):
+        index = seqs.index
+    seqs = [seq.upper() for seq in _as_seq_list(seqs)]
+
+    lengths = np.array([len(seq) for seq in seqs], dtype=np.int64)
+
+    # Encoding sequences as one concatenated array of ASCII codes
+    # (Non-ASCII characters are replaced by '?', so they count toward length but no amino acid)
+    buf = np.frombuffer(''.join(seqs).encode('ascii', errors='replace'), dtype=np.uint8)
+
+    # Calculating frequencies with a compiled kernel for large batches
+    if len(seqs) >= amino_acid_batch_threshold:
+        offs = np.concatenate(([0], np.cumsum(lengths)))
+        counts = np.zeros((len(seqs), len(amino_acids)))
+        _aa_freq_batch_kernel()(buf, offs, counts, AA_INDEX)
+        freqs = pd.DataFrame(counts, index=index, columns=amino_acids)
+        return freqs
+
+    # Calculating frequencies by counting (sequence, amino acid) index pairs
+    rows = np.repeat(np.arange(len(seqs)), lengths)
+    valid = VALID_MASK[buf]
+    pairs = rows[valid] * len(amino_acids) + AA_INDEX[buf[valid]]
+    counts = np.bincount(pairs, minlength=len(seqs) * len(amino_acids)).reshape(len(seqs), len(amino_acids))
+    freqs = pd.DataFrame(counts / lengths[:, None], index=index, columns=amino_acids)
 
     return freqs
 
 
+#························································································#
+@functools.lru_cache(maxsize=16384)
+def _aa_freqs(seq: str) -> tuple:
+    """
+
+    Takes a sequence, returns a tuple of the frequency of each amino acid (See `amino_acids`).
+
+    Results are memoized, as the same sequences are often evaluated repeatedly.
+
+    """
+
+    seq = seq.upper()
+
+    return tuple(seq.count(aa) / len(seq) for aa in amino_acids)
+
+
+#························································································#
+amino_acid_batch_threshold = 10000
+"""
+
+The minimum number of sequences for `amino_acid_content` to use the compiled `_aa_freq_batch` kernel;
+Below this, the one-off cost of importing Numba and loading the kernel outweighs its speed-up.
+
+"""
+
+
+#························································································#
+@functools.cache
+def _aa_freq_batch_kernel():
+    """
+
+    Returns the compiled `_aa_freq_batch` kernel.
+
+    Numba is imported and the kernel defined on first use, as Numba is slow to import
+    and the kernel is only used for large batches.
+
+    """
+
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _aa_freq_batch(buf, offs, out, lut):
+        """
+
+        Takes a concatenation of sequences as ASCII codes and the offsets of each sequence herein,
+        fills `out` with the frequency of each amino acid (Indexed by `lut`, see `AA_INDEX`) in each sequence.
+
+        """
+
+        # Looping over sequences in parallel
+        for i in prange(offs.size - 1):
+            s, e = offs[i], offs[i + 1]
+
+            # Counting amino acids
+            for j in range(s, e):
+                c = lut[buf[j]]
+                if c >= 0:
+                    out[i, c] += 1
+
+            # Normalising by sequence length
+            L = e - s
+            for k in range(out.shape[1]):
+                out[i, k] /= L
+
+    return _aa_freq_batch
+
+
 #························································································#
 #··································· C I D E R ··········································#
 #························································································#
 
-def cider_parameters(seqs) -> pd.DataFrame:
+def cider_parameters(seqs, n_jobs: int=-1, engine: str=None, chunksize: int=256, index=None) -> pd.DataFrame:
     """
 
     Takes one or more sequences, returns a DataFrame of CIDER parameters.
@@ -228,9 +403,25 @@ def cider_parameters(seqs) -> pd.DataFrame:
     Parameters
     ----------
     
-        `seqs`: `str | list | pandas.Series`
+        `seqs`: `str | list | numpy.ndarray | pandas.Series`
             Sequence(s) to calculate parameters for (`str`, `list` interpreted single sequence)
 
+        `n_jobs`: `int`
+            Number of processes to calculate parameters with (-1 = all cores);
+            Only used for at least `cider_parallel_threshold` sequences, and if joblib is installed
+
+        `engine`: `str`
+            A task scheduler to distribute the calculation with for large sets of sequences ('dask' or 'ray');
+            With 'dask', an active `dask.distributed.Client` is needed to use more than the local machine;
+            Default (`None`) is to use local processes only (See `n_jobs`)
+
+        `chunksize`: `int`
+            Number of sequences per task when using an `engine`
+
+        `index`: `list | pandas.Index`
+            Index of the returned DataFrame;
+            Default is the index of `seqs` if a `pandas.Series`, otherwise a range index
+
     Returns
     -------
 
@@ -239,28 +430,252 @@ def cider_parameters(seqs) -> pd.DataFrame:
 
     """
 
-    # Formatting sequence(s) as a pd.Series
-    if type(seqs) == str:
-        seqs = pd.Series([seqs])
-    elif type(seqs) == list:
-        seqs = pd.Series([''.join(seqs)])
-    
-    # Mapping sequence(s) to a SequenceParameteres object
-    seqs = seqs.map(SequenceParameters)
+    # Checking engine
+    if engine not in (None, 'dask', 'ray'):
+        raise ValueError(f"Engine '{engine}' is not valid, see documentation!")
+
+    # Formatting sequence(s) as a list (Keeping the index of a pd.Series)
+    if index is None and isinstance(seqs, pd.Series):
+        index = seqs.index
+    if isinstance(seqs, list):
+        seqs = [''.join(seqs)]
+    else:
+        seqs = _as_seq_list(seqs)
 
-    # Initiating DataFrame
-    params = pd.DataFrame(index=seqs.index)
+    # Calculating kappa with localCIDER
+    kappa = _cider_kappa(seqs, n_jobs, engine, chunksize)
 
-    # Calculating parameters
-    params['kappa'] = seqs.apply(lambda SeqOb: SeqOb.get_kappa())
-    params['FCR'] = seqs.apply(lambda SeqOb: SeqOb.get_FCR())
-    params['NCPR'] = seqs.apply(lambda SeqOb: SeqOb.get_NCPR())
-    params['Hydrophobicity'] = seqs.apply(lambda SeqOb: SeqOb.get_mean_hydropathy())
-    params['Frac. dis. prom.'] = seqs.apply(lambda SeqOb: SeqOb.get_fraction_disorder_promoting())
+    # Calculating composition-based parameters from amino acid frequencies
+    freqs = amino_acid_content(seqs).to_numpy()
+    params = pd.DataFrame(freqs @ cider_weights, index=index, columns=cider_columns[1:])
+    params.insert(0, 'kappa', kappa)
 
     return params
 
 
+#························································································#
+cider_columns = ['kappa', 'FCR', 'NCPR', 'Hydrophobicity', 'Frac. dis. prom.']
+"""
+
+A list of the names of the CIDER parameters returned by `cider_parameters` (in order).
+
+"""
+
+
+#························································································#
+cider_parallel_threshold = 32
+"""
+
+The minimum number of sequences for `cider_parameters` to calculate kappa in parallel.
+
+"""
+
+
+#························································································#
+amino_acid_hydropathy = pd.Series({
+    'A': 6.3,
+    'C': 7.0,
+    'D': 1.0,
+    'E': 1.0,
+    'F': 7.3,
+    'G': 4.1,
+    'H': 1.3,
+    'I': 9.0,
+    'K': 0.6,
+    'L': 8.3,
+    'M': 6.4,
+    'N': 1.0,
+    'P': 2.9,
+    'Q': 1.0,
+    'R': 0.0,
+    'S': 3.7,
+    'T': 3.8,
+    'V': 8.7,
+    'W': 3.6,
+    'Y': 3.2
+})
+"""
+
+A pd.Series of the hydropathy of amino acids on the Kyte-Doolittle scale shifted to [0:9],
+as used by localCIDER for the mean hydropathy.
+
+--------------------------------------------------------------------------------
+
+Schema
+------
+
+    `<AA>`: One-letter code for amino acid
+
+        `<hydropathy>`: The shifted Kyte-Doolittle hydropathy of the amino acid
+
+"""
+
+
+#························································································#
+disorder_promoting = ['T', 'A', 'G', 'R', 'D', 'H', 'Q', 'K', 'S', 'E', 'P']
+"""
+
+A list of the one-letter codes of disorder-promoting amino acids, as defined by localCIDER.
+
+"""
+
+
+#························································································#
+cider_weights = np.stack([
+    np.isin(amino_acids, ['K', 'R', 'D', 'E']).astype(float),
+    np.isin(amino_acids, ['K', 'R']).astype(float) - np.isin(amino_acids, ['D', 'E']),
+    amino_acid_hydropathy[amino_acids].to_numpy(),
+    np.isin(amino_acids, disorder_promoting).astype(float)
+], axis=1)
+"""
+
+An array of per-amino acid weights, such that the amino acid frequencies of a sequence multiplied
+by it give the FCR, NCPR, Hydrophobicity, and Frac. dis. prom. of the sequence (See `cider_columns`).
+
+"""
+
+
+#························································································#
+_kappa_cache = OrderedDict()
+"""
+
+A dictionary memoizing the kappa of sequences, ordered from least to most recently used.
+Holds at most `kappa_cache_size` sequences.
+
+"""
+
+
+#························································································#
+kappa_cache_size = 16384
+"""
+
+The maximum number of sequences to memoize kappa for in `cider_parameters`.
+
+"""
+
+
+#························································································#
+def _kappa(seq: str) -> float:
+    """
+
+    Takes a sequence, returns its kappa as calculated by localCIDER.
+
+    """
+
+    # Importing localCIDER here, as it is slow to import and only needed for kappa
+    from localcider.sequenceParameters import SequenceParameters
+
+    return SequenceParameters(seq).get_kappa()
+
+
+#························································································#
+@functools.cache
+def _has_joblib() -> bool:
+    """
+
+    Returns whether joblib is installed, as it is optional for calculating kappa in parallel.
+
+    """
+
+    try:
+        import joblib
+    except ImportError:
+        return False
+
+    return True
+
+
+#························································································#
+def _cider_kappa(seqs: list, n_jobs: int, engine: str, chunksize: int) -> list:
+    """
+
+    Takes a list of sequences, returns a list of their kappa (See `cider_parameters` for arguments).
+
+    Each unique sequence is only calculated once, and results are memoized in the calling process,
+    as the same sequences are often evaluated repeatedly. Only sequences not already memoized are
+    sent to worker processes.
+
+    """
+
+    # Finding unique sequences, and which of those are not memoized
+    uniq = list(dict.fromkeys(seqs))
+    misses = [seq for seq in uniq if seq not in _kappa_cache]
+
+    # Calculating missing kappa (In parallel for many sequences, as spawning processes has an overhead)
+    if engine is not None and misses:
+        kappa = _cider_distributed(misses, engine, chunksize)
+    elif len(misses) >= cider_parallel_threshold and n_jobs != 1 and _has_joblib():
+        from joblib import Parallel, delayed
+        kappa = Parallel(n_jobs=n_jobs, backend='loky', batch_size='auto')(delayed(_kappa)(seq) for seq in misses)
+    else:
+        kappa = [_kappa(seq) for seq in misses]
+
+    # Looking up memoized kappa
+    results = dict(zip(misses, kappa))
+    for seq in uniq:
+        if seq not in results:
+            results[seq] = _kappa_cache[seq]
+            _kappa_cache.move_to_end(seq)
+
+    # Memoizing new kappa, discarding the least recently used beyond the cache size
+    _kappa_cache.update(zip(misses, kappa))
+    while len(_kappa_cache) > kappa_cache_size:
+        _kappa_cache.popitem(last=False)
+
+    # Mapping kappa back onto the sequences
+    kappa = [results[seq] for seq in seqs]
+
+    return kappa
+
+
+#························································································#
+def _cider_chunk(seqs: list) -> list:
+    """
+
+    Takes a list of sequences, returns a list of their kappa (See `_kappa`).
+
+    """
+
+    return [_kappa(seq) for seq in seqs]
+
+
+#························································································#
+def _cider_distributed(seqs: list, engine: str, chunksize: int) -> list:
+    """
+
+    Takes a list of sequences, returns a list of their kappa calculated in chunks with a task scheduler.
+    Chunks should be large enough for each task to take well over a second, as scheduling has an overhead.
+
+    With dask, chunks run on an active `dask.distributed.Client` if there is one (Needed to spread
+    work across machines), otherwise on local processes, as localCIDER holds the GIL.
+
+    """
+
+    # Partitioning sequences into chunks
+    chunks = [seqs[i:i + chunksize] for i in range(0, len(seqs), chunksize)]
+
+    # Calculating chunks with the chosen task scheduler
+    if engine == 'dask':
+        import dask
+        tasks = [dask.delayed(_cider_chunk)(chunk) for chunk in chunks]
+        try:
+            from distributed import get_client
+            get_client()
+            has_client = True
+        except (ImportError, ValueError):
+            has_client = False
+        results = dask.compute(*tasks, scheduler=None if has_client else 'processes')
+    else:
+        import ray
+        task = ray.remote(_cider_chunk)
+        results = ray.get([task.remote(chunk) for chunk in chunks])
+
+    # Joining chunks
+    kappa = list(itertools.chain.from_iterable(results))
+
+    return kappa
+
+
 #························································································#
 #······························ T R A J E C T O R Y ·····································#
 #························································································#
@@ -369,7 +784,7 @@ def compute_energy(traj: md.Trajectory, cond='default', ah=True, dh=True, hb=Fal
     
 
     # Preparing global parameters
-    cond = conditions.loc[cond]
+    cond = conditions[cond]
     r_0=0.38
     k=8033
     e = simulate_utils.ah_parameters(cond.eps_factor)
@@ -8,82 +8,41 @@
 """
 
 
-import pandas as pd
+from dataclasses import dataclass, asdict
 import argparse
 
 
 #························································································#
 
-conditions = pd.DataFrame(
-[
-    {
-        "name":"default",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.15
-    },
-    {
-        "name":"Borgia_in_silico",
-        "eps_factor":0.2,
-        "temp":300,
-        "pH":6.0,
-        "ionic":0.165
-    },
-    {
-        "name":"ionic_165",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.165
-    },
-    {
-        "name":"ionic_180",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.180
-    },
-    {
-        "name":"ionic_205",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.205
-    },
-    {
-        "name":"ionic_240",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.240
-    },
-    {
-        "name":"ionic_290",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.290
-    },
-    {
-        "name":"ionic_330",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.330
-    },
-    {
-        "name":"ionic_340",
-        "eps_factor":0.2,
-        "temp":298,
-        "pH":7.0,
-        "ionic":0.340
-    }
-]
-).set_index('name')
+@dataclass(frozen=True)
+class Condition:
+    """
+
+    A standard condition setup (See `conditions` for fields).
+
+    """
+    eps_factor: float
+    temp: float
+    pH: float
+    ionic: float
+
+
+#························································································#
+
+conditions = {
+    "default": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.15),
+    "Borgia_in_silico": Condition(eps_factor=0.2, temp=300, pH=6.0, ionic=0.165),
+    "ionic_165": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.165),
+    "ionic_180": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.180),
+    "ionic_205": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.205),
+    "ionic_240": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.240),
+    "ionic_290": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.290),
+    "ionic_330": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.330),
+    "ionic_340": Condition(eps_factor=0.2, temp=298, pH=7.0, ionic=0.340),
+}
 """
 
-A DataFrame containing standard condition setups.
+A dictionary containing standard condition setups.
 
 --------------------------------------------------------------------------------
 
@@ -97,8 +56,8 @@ Setups
 Fields
 ------
 
-    `name`: `str`
-        Setup name
+    `<name>`: `str`
+        Setup name (Key of the dictionary)
 
     `eps_factor`: `float`
         TODO The solvent ??? permittivity [?]
@@ -114,6 +73,23 @@ Fields
 
 """
 
+#························································································#
+
+def to_frame():
+    """
+
+    Returns the standard condition setups as a pandas.DataFrame indexed by setup name.
+
+    """
+
+    import pandas as pd
+
+    frame = pd.DataFrame.from_dict({name: asdict(c) for name, c in conditions.items()}, orient='index')
+    frame.index.name = 'name'
+
+    return frame
+
+
 #························································································#
 
 if __name__ == '__main__':
@@ -127,7 +103,7 @@ if __name__ == '__main__':
     
     # Producing .csv
     if parser.parse_args().csv:
-        conditions.to_csv("conditions.csv")
+        to_frame().to_csv("conditions.csv")
 
     # Printing
-    print(conditions)
\ No newline at end of file
+    print(to_frame())
\ No newline at end of file
@@ -11,13 +11,13 @@
 import requests
 import io
 import random
+import numpy as np
 import pandas as pd
 from Bio import SeqIO
 from Bio import SwissProt
 from Bio.SwissProt import Record
 
 from residues import residues
-import analyse_utils
 
 
 #························································································#
@@ -455,22 +455,23 @@ def average_sequence(seqs) -> str:
     
     """
 
-    # Setting datatype to Series
-    seqs = pd.Series(seqs)
+    # Importing analysis utils here, as they are slow to import and only needed for averaging
+    import analyse_utils
+
+    # Setting datatype to list
+    seqs = list(seqs)
 
     # Finding average amino acid frequencies
     freqs = analyse_utils.amino_acid_content(seqs).mean()
 
     # Finding average length
-    N = seqs.str.len().mean()
+    N = np.fromiter(map(len, seqs), dtype=np.int64, count=len(seqs)).mean()
 
     # Finding average amino acid counts
     counts = freqs * N
 
-    # Assembling random sequence using counts
-    avg = ''
-    for aa, c in counts.items():
-        avg += aa * round(c)
-    avg = shuffle_seq(avg, seed=1)
+    # Assembling random sequence using counts (As ASCII codes)
+    pool = np.repeat(analyse_utils.AA_ORDS, counts.to_numpy().round().astype(np.int64))
+    avg = shuffle_seq(pool.tobytes().decode('ascii'), seed=1)
 
     return avg
\ No newline at end of file
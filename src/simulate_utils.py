@@ -102,7 +102,7 @@ def openmm_simulate(dir: str, steps: int, top_path: str=None, sequence: str=None
 
     # Getting conditions and residue data
     log.message(f"[{dt.now()}] Preparing simulation with '{cond}' conditions")
-    condition = conditions.loc[cond]
+    condition = conditions[cond]
 
     # Calculating histidine charge based on Henderson-Hasselbalch equation
     H_pKa = 6